@@ -1,12 +1,127 @@
 #!/usr/bin/env python3
+import ast
 import json
 import os
-from tabulate import tabulate
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
-import yaml
 import re
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    # google-re2 matches in linear time, which keeps large build logs cheap to scan
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# Straight and curly quote characters R uses around names in its messages
+_QUOTE_CHARS = "\"'\u201c\u201d\u2018\u2019"
+_QUOTE_CLASS = f"[{_QUOTE_CHARS}]"
+_NON_QUOTE = f"[^{_QUOTE_CHARS}]"
+
+# More comprehensive error patterns with all quote types; each has one capture group
+_FAILURE_PATTERNS = [
+    (rf"there is no package called {_QUOTE_CLASS}({_NON_QUOTE}+){_QUOTE_CLASS}", "Missing R dependency"),
+    (rf"ERROR: dependencies? {_QUOTE_CLASS}({_NON_QUOTE}+){_QUOTE_CLASS} (?:is|are) not available", "Missing dependency"),
+    (rf"ERROR: package {_QUOTE_CLASS}({_NON_QUOTE}+){_QUOTE_CLASS} (?:is|was) not found", "Package not found"),
+    (r"ERROR: System command error.*?:\n\s*([^\n]+)", "System command failed"),
+    (r"Installation failed:[\r\n]+\s*([^\r\n]+)", "Installation failed"),
+    (r"error: command .*? failed with exit status \d+[\r\n]+\s*([^\r\n]+)", "Command error"),
+    (r"error: Error installing package.*?:\n\s*([^\n]+)", "Installation error"),
+    (r"configure: error:.*?([^\n]+)", "Configure error"),
+    (r"ERROR:\s+compilation failed for package.*?([^\n]+)", "Compilation failed")
+]
+
+# All patterns merged into one alternation so a log is scanned in a single pass.
+# Each pattern is wrapped in a named group; its capture group directly follows it.
+# Flags are inlined because re2 does not accept the re module's flag arguments.
+_FAILURE_REGEX = _regex.compile(
+    "(?im)" + "|".join(f"(?P<p{i}>{pattern})" for i, (pattern, _) in enumerate(_FAILURE_PATTERNS))
+)
+_FAILURE_GROUPS = {
+    f"p{i}": (msg, _FAILURE_REGEX.groupindex[f"p{i}"] + 1)
+    for i, (_, msg) in enumerate(_FAILURE_PATTERNS)
+}
+
+# Packages bundled with R itself, which have no CRAN page to check
+_BASE_R_PACKAGES = frozenset({
+    "base", "compiler", "datasets", "graphics", "grDevices", "grid",
+    "methods", "parallel", "splines", "stats", "stats4", "tcltk",
+    "tools", "utils"
+})
+
+# Common error keywords, searched for together in one pass when no pattern matches
+_ERROR_KEYWORDS = [
+    "error:", "Error:", "ERROR:", 
+    "failed", "Failed", "FAILED",
+    "cannot find", "not found",
+    "could not", "unable to"
+]
+_ERROR_KEYWORD_REGEX = re.compile("|".join(re.escape(kw) for kw in _ERROR_KEYWORDS))
+
+# Bytes at the end of a failure log scanned before falling back to the whole file
+LOG_TAIL_BYTES = 64 * 1024
+
+# How far past a match a pattern starting inside it may extend and still be found
+OVERLAP_WINDOW_CHARS = 1024
+
+# Concurrent HTTP lookups against CRAN and the Bioconductor build system
+HTTP_WORKERS = 32
+# How long cached CRAN/BBS responses are reused across workflow runs (seconds)
+HTTP_CACHE_TTL = 3 * 60 * 60
+
+# Connections kept alive per host; CRAN and BBS are each hit by every worker
+HTTP_POOL_SIZE = 64
+
+def mount_http_adapter(session):
+    """Pool keep-alive connections and retry transient server errors with backoff"""
+    retries = Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=retries
+    )
+    session.mount("https://", adapter)
+    return session
+
+# Shared HTTP session, swapped for a persistent cache by setup_http_session
+_session = mount_http_adapter(requests.Session())
+
+def load_json(path):
+    """Load a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def dumps_json(obj):
+    """Serialize an object to a compact JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+def dump_json(obj, path):
+    """Write an object to a JSON file"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dumps_json(obj) + "\n")
 
 def get_container_version(container_file):
     """Gets bioc version from container tag"""
@@ -14,16 +129,31 @@ def get_container_version(container_file):
         container = f.read().strip()
     return container.split(":")[-1]
 
+def setup_http_session(run_id):
+    """Cache HTTP responses on disk in the run's cache directory"""
+    # BBS statuses are fetched once per package across runs, so this mostly
+    # saves repeated CRAN lookups for dependencies missing in several runs
+    global _session
+    if requests_cache is None:
+        return
+    _session = mount_http_adapter(requests_cache.CachedSession(
+        f"runs/{run_id}/cache/http",
+        expire_after=HTTP_CACHE_TTL,
+        allowable_codes=(200,),
+        cache_control=True
+    ))
+
+def prune_http_cache():
+    """Drop expired responses so the committed cache database stops growing"""
+    if requests_cache is not None and isinstance(_session, requests_cache.CachedSession):
+        _session.cache.delete(expired=True, vacuum=True)
+
+@functools.lru_cache(maxsize=None)
 def check_cran_archived(pkg):
     """Checks if a package has been archived on CRAN"""
     cranurl = f"https://cran.r-project.org/web/packages/{pkg}/index.html"
     try:
-        r = requests.get(cranurl, timeout=10)
-        retries = 0
-        while retries <= 5 and r.status_code != 200:
-            r = requests.get(cranurl, timeout=10)
-            retries += 1
-            time.sleep(2)
+        r = _session.get(cranurl, timeout=10)
         if r.status_code == 200:
             crantext = r.content.decode("utf-8")
             for search in ["Archived on", "Removed on"]:
@@ -34,17 +164,13 @@ def check_cran_archived(pkg):
         pass
     return None
 
+@functools.lru_cache(maxsize=None)
 def get_bbs_status(pkg, bioc_version):
     """Get current BBS build status for package"""
     bbsurl = f"https://bioconductor.org/checkResults/{bioc_version}/bioc-LATEST/{pkg}"
     statusurl = f"{bbsurl}/raw-results/nebbiolo2/buildsrc-summary.dcf"
     try:
-        r = requests.get(statusurl, timeout=10)
-        retries = 0
-        while retries <= 5 and r.status_code != 200:
-            r = requests.get(statusurl, timeout=10)
-            retries += 1
-            time.sleep(2)
+        r = _session.get(statusurl, timeout=10)
         if r.status_code == 200:
             try:
                 bbs_summary = r.content.decode("utf-8")
@@ -58,75 +184,108 @@ def get_bbs_status(pkg, bioc_version):
         pass
     return "Not Found"
 
-def check_failure_reason(log_content):
-    """Extract all possible failure reasons from log file"""
-    reasons = []
-    # More comprehensive error patterns with all quote types
-    patterns = [
-        (r"there is no package called [\"'“”‘’]([^\"'“”‘’]+)[\"'“”‘’]", "Missing R dependency"),
-        (r"ERROR: dependencies? [\"'“”‘’]([^\"'“”‘’]+)[\"'“”‘’] (?:is|are) not available", "Missing dependency"),
-        (r"ERROR: package [\"'“”‘’]([^\"'“”‘’]+)[\"'“”‘’] (?:is|was) not found", "Package not found"),
-        (r"ERROR: System command error.*?:\n\s*([^\n]+)", "System command failed"),
-        (r"Installation failed:[\r\n]+\s*([^\r\n]+)", "Installation failed"),
-        (r"error: command .*? failed with exit status \d+[\r\n]+\s*([^\r\n]+)", "Command error"),
-        (r"error: Error installing package.*?:\n\s*([^\n]+)", "Installation error"),
-        (r"configure: error:.*?([^\n]+)", "Configure error"),
-        (r"ERROR:\s+compilation failed for package.*?([^\n]+)", "Compilation failed")
-    ]
-    
-    for pattern, msg in patterns:
-        matches = re.findall(pattern, log_content, re.IGNORECASE | re.MULTILINE)
-        for match in matches:
-            reason = f"{msg}: {match}"
-            reasons.append(reason)
-            # Check CRAN status for failed dependency
-            if any(x in msg.lower() for x in ["dependency", "package"]):
-                archived = check_cran_archived(match.strip())
-                if archived:
-                    reasons.append(archived)
-    
-    if not reasons:
-        # Check for common error keywords
-        error_keywords = [
-            "error:", "Error:", "ERROR:", 
-            "failed", "Failed", "FAILED",
-            "cannot find", "not found",
-            "could not", "unable to"
-        ]
-        for line in log_content.split('\n'):
-            if any(kw in line for kw in error_keywords):
-                reasons.append(line.strip())
+def find_failure_matches(log_content):
+    """Find (message, detail) pairs for every known error pattern in a log"""
+    matches = []
+    for m in _FAILURE_REGEX.finditer(log_content):
+        msg, group = _FAILURE_GROUPS[m.lastgroup]
+        matches.append((msg, m.group(group)))
+        # finditer skips patterns starting inside this match (e.g. "error:
+        # command ... failed" within a "configure: error:" line), so rescan a
+        # small window from just after its start for those
+        window = log_content[m.start() + 1:m.end() + OVERLAP_WINDOW_CHARS]
+        span_end = m.end() - m.start() - 1
+        for inner in _FAILURE_REGEX.finditer(window):
+            if inner.start() >= span_end:
                 break
-        
-        if not reasons:
-            reasons.append("Build failed with unknown error")
-    
+            msg, group = _FAILURE_GROUPS[inner.lastgroup]
+            matches.append((msg, inner.group(group)))
+    return matches
+
+def find_fallback_reason(log_content):
+    """Find the first line with a common error keyword, for logs matching no pattern"""
+    keyword = _ERROR_KEYWORD_REGEX.search(log_content)
+    if not keyword:
+        return "Build failed with unknown error"
+    start = log_content.rfind("\n", 0, keyword.start()) + 1
+    end = log_content.find("\n", keyword.end())
+    if end == -1:
+        end = len(log_content)
+    return log_content[start:end].strip()
+
+def is_dependency_failure(msg):
+    """Whether a failure pattern message names a missing dependency or package"""
+    return any(x in msg.lower() for x in ["dependency", "package"])
+
+def describe_failure(matches):
+    """Turn failure matches into README reasons, checking CRAN for missing dependencies"""
+    reasons = []
+    for msg, match in matches:
+        # Fallback reasons have no pattern message and are reported as-is
+        if msg is None:
+            reasons.append(match)
+            continue
+        reason = f"{msg}: {match}"
+        reasons.append(reason)
+        # Check CRAN status for failed dependency; base R packages are never on CRAN
+        if is_dependency_failure(msg):
+            dependency = match.strip()
+            if dependency in _BASE_R_PACKAGES:
+                continue
+            archived = check_cran_archived(dependency)
+            if archived:
+                reasons.append(archived)
     return reasons
 
-def load_cached_results(run_id):
-    """Load previously processed package results"""
-    handled_file = f"runs/{run_id}/cache/handled_packages.txt"
-    
-    handled_packages = set()
-    os.makedirs(f"runs/{run_id}/cache", exist_ok=True)
-    
-    # Load packages we've already handled in README
-    if os.path.exists(handled_file):
-        with open(handled_file) as f:
-            handled_packages.update(line.strip() for line in f if line.strip())
-    
-    return handled_packages
+def decode_log(data):
+    """Decode raw log bytes, normalising line endings as text mode would"""
+    return data.decode("utf-8", "replace").replace("\r\n", "\n").replace("\r", "\n")
 
-def save_handled_packages(run_id, handled_packages):
-    """Save list of packages we've processed for README"""
-    handled_file = f"runs/{run_id}/cache/handled_packages.txt"
-    with open(handled_file, 'w') as f:
-        for pkg in sorted(handled_packages):
-            f.write(f"{pkg}\n")
+def parse_failure_log(log_path):
+    """Read a build failure log and find its failure matches, without network access"""
+    # Most fatal errors are at the end of the log, so try the tail first. R
+    # reports missing dependencies near the start of an install log though,
+    # and those are the most useful reasons, so read the whole file unless
+    # the tail already names one.
+    with open(log_path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - LOG_TAIL_BYTES))
+        log_content = decode_log(f.read())
+        matches = find_failure_matches(log_content)
+        has_dependency = any(is_dependency_failure(msg) for msg, _ in matches)
+        if not has_dependency and size > LOG_TAIL_BYTES:
+            f.seek(0)
+            log_content = decode_log(f.read())
+            matches = find_failure_matches(log_content)
+    if not matches:
+        matches = [(None, find_fallback_reason(log_content))]
+    return matches
+
+def format_table_cell(cell):
+    """Escape a value for use inside a Markdown table cell"""
+    return str(cell).replace("|", "\\|").replace("\n", "<br>")
+
+def markdown_table(rows, headers):
+    """Render rows as a GitHub-flavored Markdown pipe table"""
+    lines = ["| " + " | ".join(headers) + " |", "|" + "---|" * len(headers)]
+    lines.extend(
+        "| " + " | ".join(format_table_cell(cell) for cell in row) + " |"
+        for row in rows
+    )
+    return "\n".join(lines) + "\n"
+
+def parse_table_cache_line(line):
+    """Parse one cached table row, accepting the legacy repr() format"""
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        # Caches written before the switch to JSON hold Python list literals
+        return ast.literal_eval(line.strip())
 
 def load_table_cache(run_id):
     """Load previously processed package results with their full table entries"""
     cache_dir = f"runs/{run_id}/cache"
+    state_file = f"{cache_dir}/state.json"
     succeeded_file = f"{cache_dir}/table_succeeded.txt"
     failed_file = f"{cache_dir}/table_failed.txt"
     handled_file = f"{cache_dir}/handled_packages.txt"
@@ -134,54 +293,83 @@ def load_table_cache(run_id):
     cache = {
         "succeeded": [],  # List of [pkg_link, status, log_link, bbs] entries
         "failed": [],    # List of [pkg_link, status, log_link, bbs, reasons] entries
-        "handled_packages": set()
+        # Insertion-ordered dict used as a set: the sorted names from disk,
+        # followed by the names handled in this run, added in sorted order
+        "handled_packages": {}
     }
     
     os.makedirs(cache_dir, exist_ok=True)
     
+    if os.path.exists(state_file):
+        state = load_json(state_file)
+        cache["succeeded"] = state["succeeded"]
+        cache["failed"] = state["failed"]
+        cache["handled_packages"] = dict.fromkeys(state["handled_packages"])
+        return cache
+    
+    # Fall back to the per-table text files written by earlier versions
     if os.path.exists(succeeded_file):
         with open(succeeded_file) as f:
             for line in f:
                 if line.strip():
-                    cache["succeeded"].append(eval(line.strip()))
+                    cache["succeeded"].append(parse_table_cache_line(line))
     
     if os.path.exists(failed_file):
         with open(failed_file) as f:
             for line in f:
                 if line.strip():
-                    cache["failed"].append(eval(line.strip()))
+                    cache["failed"].append(parse_table_cache_line(line))
     
     if os.path.exists(handled_file):
         with open(handled_file) as f:
-            cache["handled_packages"].update(line.strip() for line in f if line.strip())
+            cache["handled_packages"] = dict.fromkeys(line.strip() for line in f if line.strip())
     
     return cache
 
 def save_table_cache(run_id, cache):
-    """Save table entries and handled packages list"""
+    """Save table entries and handled packages list as a single state file"""
     cache_dir = f"runs/{run_id}/cache"
-    succeeded_file = f"{cache_dir}/table_succeeded.txt"
-    failed_file = f"{cache_dir}/table_failed.txt"
-    handled_file = f"{cache_dir}/handled_packages.txt"
-    
-    with open(succeeded_file, 'w') as f:
-        for entry in cache["succeeded"]:
-            f.write(f"{entry}\n")
-    
-    with open(failed_file, 'w') as f:
-        for entry in cache["failed"]:
-            f.write(f"{entry}\n")
-    
-    with open(handled_file, 'w') as f:
-        for pkg in sorted(cache["handled_packages"]):
-            f.write(f"{pkg}\n")
+    state = {
+        "succeeded": cache["succeeded"],
+        "failed": cache["failed"],
+        # Two ascending runs, which sorted() merges in linear time
+        "handled_packages": sorted(cache["handled_packages"])
+    }
+    # One row per line keeps the committed file diffable between runs
+    sections = [
+        f"{dumps_json(key)}: [\n" + ",\n".join(dumps_json(row) for row in rows) + "\n]"
+        for key, rows in state.items()
+    ]
+    with open(f"{cache_dir}/state.json", "w", encoding="utf-8") as f:
+        f.write("{\n" + ",\n".join(sections) + "\n}\n")
+
+def get_readme_run_id(readme_file="README.md"):
+    """Get the run ID recorded in an existing README, if any"""
+    if not os.path.exists(readme_file):
+        return None
+    with open(readme_file) as f:
+        for line in f:
+            if line.startswith("**Run ID:**"):
+                return line.split("**Run ID:**", 1)[1].strip()
+    return None
+
+def load_last_written(run_id):
+    """Load the run ID and table sizes the README was last written with"""
+    last_written_file = f"runs/{run_id}/cache/last_written.json"
+    if not os.path.exists(last_written_file):
+        return None
+    return load_json(last_written_file)
+
+def save_last_written(run_id, counts):
+    """Record the run ID and table sizes of the README just written"""
+    last_written_file = f"runs/{run_id}/cache/last_written.json"
+    dump_json({"run_id": run_id, "counts": counts}, last_written_file)
 
 def main(run_id):
     print(f"Starting README update for run {run_id}")
     
     # Load package info, version and existing table cache
-    with open(f"runs/{run_id}/biocdeps.json") as f:
-        packages = json.load(f)
+    packages = load_json(f"runs/{run_id}/biocdeps.json")
     bioc_version = get_container_version(f"runs/{run_id}/CONTAINER_BASE_IMAGE.bioc")
     cache = load_table_cache(run_id)
     
@@ -196,35 +384,78 @@ def main(run_id):
             successful = {line.strip() for line in f if line.strip()}
     
     failed_dir = f"runs/{run_id}/logs"
-    failed = {pkg for pkg in packages if os.path.exists(f"{failed_dir}/{pkg}/build-fail.log")}
+    # List the log directories once so only packages with logs need a stat
+    log_dirs = set()
+    if os.path.isdir(failed_dir):
+        with os.scandir(failed_dir) as entries:
+            log_dirs = {entry.name for entry in entries if entry.is_dir()}
+    failed = {
+        pkg for pkg in packages
+        if pkg in log_dirs and os.path.exists(f"{failed_dir}/{pkg}/build-fail.log")
+    }
     
     # Process only unhandled packages
-    new_packages = (successful | failed) - cache["handled_packages"]
+    new_packages = (successful | failed) - cache["handled_packages"].keys()
     print(f"Found {len(new_packages)} new packages to document")
     
-    # Process new packages
-    for pkg in sorted(new_packages):
-        pkg_url = f"https://bioconductor.org/packages/{bioc_version}/bioc/html/{pkg}.html"
-        pkg_link = f"[{pkg}]({pkg_url})"
-        
-        if pkg in successful:
-            print(f"Checking BBS status for {pkg}...")
-            log_path = f"runs/{run_id}/logs/{pkg}/build-success.log"
-            log_link = f"[Log]({log_path})"
-            bbs = get_bbs_status(pkg, bioc_version)
-            cache["succeeded"].append([pkg_link, "Built", log_link, bbs])
-            cache["handled_packages"].add(pkg)
+    # Nothing changed since the README was written for this run, so it would be identical
+    if not new_packages and get_readme_run_id() == run_id:
+        counts = {
+            "succeeded": len(cache["succeeded"]),
+            "failed": len(cache["failed"]),
+            "unprocessed": sum(1 for pkg in packages if pkg not in cache["handled_packages"])
+        }
+        last_written = load_last_written(run_id)
+        if last_written is not None and last_written["counts"] == counts:
+            print("README is already up to date")
+            return
+    
+    setup_http_session(run_id)
+    
+    # Parsing failure logs is CPU-bound regex work, so spread it across
+    # processes. This runs before any HTTP threads exist, as forking a
+    # process with running threads can deadlock the children.
+    new_failed = sorted((new_packages - successful) & failed)
+    print(f"Analyzing failures for {len(new_failed)} packages...")
+    failure_matches = {}
+    if new_failed:
+        with ProcessPoolExecutor() as pool:
+            log_paths = [f"{failed_dir}/{pkg}/build-fail.log" for pkg in new_failed]
+            failure_matches = dict(zip(new_failed, pool.map(parse_failure_log, log_paths, chunksize=16)))
+    
+    # Fetch BBS statuses and check CRAN for failed dependencies concurrently,
+    # since these HTTP requests dominate the run time
+    with ThreadPoolExecutor(max_workers=HTTP_WORKERS) as executor:
+        print(f"Checking BBS status for {len(new_packages)} packages...")
+        bbs_futures = {
+            pkg: executor.submit(get_bbs_status, pkg, bioc_version)
+            for pkg in new_packages
+        }
+        reason_futures = {
+            pkg: executor.submit(describe_failure, matches)
+            for pkg, matches in failure_matches.items()
+        }
         
-        elif pkg in failed:
-            print(f"Analyzing failure for {pkg}...")
-            log_path = f"runs/{run_id}/logs/{pkg}/build-fail.log"
-            log_link = f"[Log]({log_path})"
-            with open(f"{failed_dir}/{pkg}/build-fail.log") as f:
-                log_content = f.read()
-            bbs = get_bbs_status(pkg, bioc_version)
-            reasons = check_failure_reason(log_content)
-            cache["failed"].append([pkg_link, "Failed", log_link, bbs, "\n".join(reasons)])
-            cache["handled_packages"].add(pkg)
+        # Process new packages
+        for pkg in sorted(new_packages):
+            pkg_url = f"https://bioconductor.org/packages/{bioc_version}/bioc/html/{pkg}.html"
+            pkg_link = f"[{pkg}]({pkg_url})"
+            bbs = bbs_futures[pkg].result()
+            
+            if pkg in successful:
+                log_path = f"runs/{run_id}/logs/{pkg}/build-success.log"
+                log_link = f"[Log]({log_path})"
+                cache["succeeded"].append([pkg_link, "Built", log_link, bbs])
+                cache["handled_packages"][pkg] = None
+            
+            elif pkg in failed:
+                log_path = f"runs/{run_id}/logs/{pkg}/build-fail.log"
+                log_link = f"[Log]({log_path})"
+                reasons = reason_futures[pkg].result()
+                cache["failed"].append([pkg_link, "Failed", log_link, bbs, "\n".join(reasons)])
+                cache["handled_packages"][pkg] = None
+    
+    prune_http_cache()
     
     # Save updated cache
     save_table_cache(run_id, cache)
@@ -245,31 +476,37 @@ def main(run_id):
     
     # Write README
     print("\nWriting README.md...")
+    parts = []
+    parts.append(f"# Bioconductor {bioc_version} Binary Building Status\n\n")
+    parts.append(f"**Run ID:** {run_id}\n\n")
+    parts.append("## Summary\n\n")
+    parts.append(f"- {len(tables['succeeded'])} packages built successfully\n")
+    parts.append(f"- {len(tables['failed'])} packages failed to build\n")
+    parts.append(f"- {len(tables['unprocessed'])} packages not yet processed\n")
+    
+    if tables["failed"]:
+        parts.append(f"\n## Failed Builds ({len(tables['failed'])})\n")
+        parts.append(markdown_table(tables["failed"], 
+            ["Package", "Status", "Log", "BBS Status", "Failure Reasons"]))
+    
+    if tables["succeeded"]:
+        parts.append(f"\n## Successfully Built ({len(tables['succeeded'])})\n")
+        parts.append(markdown_table(tables["succeeded"], 
+            ["Package", "Status", "Log", "BBS Status"]))
+    
+    if tables["unprocessed"]:
+        parts.append(f"\n## Not Yet Processed ({len(tables['unprocessed'])})\n")
+        parts.append(markdown_table(tables["unprocessed"], 
+            ["Package", "Status"]))
+    
+    # Assemble the whole README in memory and write it in one go
     with open("README.md", "w") as f:
-        f.write(f"# Bioconductor {bioc_version} Binary Building Status\n\n")
-        f.write(f"**Run ID:** {run_id}\n\n")
-        f.write("## Summary\n\n")
-        f.write(f"- {len(tables['succeeded'])} packages built successfully\n")
-        f.write(f"- {len(tables['failed'])} packages failed to build\n")
-        f.write(f"- {len(tables['unprocessed'])} packages not yet processed\n")
-        
-        if tables["failed"]:
-            f.write(f"\n## Failed Builds ({len(tables['failed'])})\n")
-            f.write(tabulate(tables["failed"], 
-                ["Package", "Status", "Log", "BBS Status", "Failure Reasons"], 
-                tablefmt="github"))
-        
-        if tables["succeeded"]:
-            f.write(f"\n\n## Successfully Built ({len(tables['succeeded'])})\n")
-            f.write(tabulate(tables["succeeded"], 
-                ["Package", "Status", "Log", "BBS Status"], 
-                tablefmt="github"))
-        
-        if tables["unprocessed"]:
-            f.write(f"\n\n## Not Yet Processed ({len(tables['unprocessed'])})\n")
-            f.write(tabulate(tables["unprocessed"], 
-                ["Package", "Status"], 
-                tablefmt="github"))
+        f.write("".join(parts))
+    save_last_written(run_id, {
+        "succeeded": len(tables["succeeded"]),
+        "failed": len(tables["failed"]),
+        "unprocessed": len(tables["unprocessed"])
+    })
 
     print("\nREADME update complete")
     print(f"Summary:")